@@ -3,14 +3,123 @@ Browser Monitor
 Detects when YouTube is opened in a browser and triggers video checking.
 """
 
+import ctypes
+import os
 import psutil
+import re
 import time
 import subprocess
 import sys
-from typing import List, Set
+from typing import Iterator, List, Set
 from youtube_notifier import YouTubeNotifier
 
 
+if sys.platform == 'win32':
+    from ctypes import wintypes
+
+    TH32CS_SNAPPROCESS = 0x00000002
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ('dwSize', wintypes.DWORD),
+            ('cntUsage', wintypes.DWORD),
+            ('th32ProcessID', wintypes.DWORD),
+            ('th32DefaultHeapID', ctypes.c_size_t),
+            ('th32ModuleID', wintypes.DWORD),
+            ('cntThreads', wintypes.DWORD),
+            ('th32ParentProcessID', wintypes.DWORD),
+            ('pcPriClassBase', ctypes.c_long),
+            ('dwFlags', wintypes.DWORD),
+            ('szExeFile', ctypes.c_wchar * 260),
+        ]
+
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    _kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    _kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    OBJID_WINDOW = 0
+    PM_REMOVE = 0x0001
+    QS_ALLINPUT = 0x04FF
+
+    WINEVENTPROC = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+    )
+
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.SetWinEventHook.argtypes = [
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WINEVENTPROC,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+    ]
+    _user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+    _user32.GetForegroundWindow.restype = wintypes.HWND
+    _user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+    _user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+    _user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+    _user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    _user32.MsgWaitForMultipleObjects.argtypes = [
+        wintypes.DWORD, ctypes.c_void_p, wintypes.BOOL, wintypes.DWORD, wintypes.DWORD
+    ]
+    _user32.PeekMessageW.argtypes = [
+        ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT, wintypes.UINT
+    ]
+    _user32.TranslateMessage.argtypes = [ctypes.POINTER(wintypes.MSG)]
+    _user32.DispatchMessageW.argtypes = [ctypes.POINTER(wintypes.MSG)]
+
+
+def _window_title(hwnd) -> str:
+    """Return the title of a window (Windows)."""
+    length = _user32.GetWindowTextLengthW(hwnd)
+    buffer = ctypes.create_unicode_buffer(length + 1)
+    _user32.GetWindowTextW(hwnd, buffer, length + 1)
+    return buffer.value
+
+
+def _toolhelp_process_names() -> Iterator[str]:
+    """Yield executable names from a single Toolhelp32 process snapshot (Windows)."""
+    snapshot = _kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        more = _kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while more:
+            yield entry.szExeFile
+            more = _kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        _kernel32.CloseHandle(snapshot)
+
+
+def _psutil_process_names() -> Iterator[str]:
+    """Yield process names through psutil (other platforms)."""
+    for proc in psutil.process_iter(['name']):
+        name = proc.info['name']
+        if name:
+            yield name
+
+
+def _proc_process_names() -> Iterator[str]:
+    """Yield process names by reading /proc/<pid>/comm (Linux)."""
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(os.path.join(entry.path, 'comm')) as f:
+                yield f.read().strip()
+        except OSError:
+            # Process exited or is not readable
+            continue
+
+
 class BrowserMonitor:
     def __init__(self, notifier: YouTubeNotifier):
         """Initialize browser monitor."""
@@ -19,87 +128,177 @@ class BrowserMonitor:
             'chrome.exe', 'firefox.exe', 'msedge.exe', 
             'opera.exe', 'brave.exe', 'vivaldi.exe'
         ]
-        self.youtube_domains = [
-            'youtube.com', 'www.youtube.com', 'm.youtube.com'
-        ]
+        # One pattern for all browsers, matching e.g. chrome, chrome.exe or firefox-bin
+        browser_names = '|'.join(
+            re.escape(os.path.splitext(name)[0]) for name in self.browser_processes
+        )
+        self._browser_re = re.compile(rf'(?:{browser_names})(?:\.exe|-bin)?', re.IGNORECASE)
         self.checked_processes: Set[int] = set()
         self.last_check_time = {}
+        # A detected browser is remembered for this long before rescanning
+        self.browser_cache_seconds = 30
+        self._browser_seen_until = 0.0
+        self.min_check_interval = 60  # Minimum seconds between video checks
+        self._last_checked = 0.0
+        self._youtube_focused = False
+        # Title-change hook for the foreground window's process (Windows)
+        self._name_hook = None
+        self._name_hook_pid = 0
+        self._win_event_callback = None
         
-    def _is_youtube_open(self) -> bool:
-        """Check if YouTube is open in any browser."""
-        try:
-            for proc in psutil.process_iter(['pid', 'name', 'connections']):
-                try:
-                    proc_name = proc.info['name'].lower()
-                    
-                    # Check if it's a browser process
-                    if any(browser in proc_name for browser in self.browser_processes):
-                        pid = proc.info['pid']
-                        
-                        # Check connections for YouTube domains
-                        connections = proc.info.get('connections', [])
-                        for conn in connections:
-                            if hasattr(conn, 'remote_address') and conn.remote_address:
-                                remote_addr = str(conn.remote_address)
-                                # Check if any YouTube domain is in the connection
-                                # Note: This is a simplified check
-                                if any(domain in remote_addr for domain in self.youtube_domains):
-                                    return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-        except Exception as e:
-            print(f"Error checking processes: {e}")
-        
-        return False
+    def _is_browser_name(self, proc_name: str) -> bool:
+        """Check whether a process name is one of the known browsers."""
+        return self._browser_re.fullmatch(proc_name) is not None
     
     def _check_browser_tabs_simple(self) -> bool:
         """
         Simple check: Look for browser processes and assume YouTube might be open.
         This is a fallback method since detailed tab checking requires browser extensions.
+        
+        A positive result is cached for browser_cache_seconds, so a long-running
+        browser does not cost a full process scan on every poll.
         """
+        now = time.time()
+        if now < self._browser_seen_until:
+            return True
+        
         try:
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    proc_name = proc.info['name'].lower()
-                    if any(browser in proc_name for browser in self.browser_processes):
-                        # Browser is running, could have YouTube open
-                        return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+            if sys.platform == 'win32':
+                names = _toolhelp_process_names()
+            elif os.path.isdir('/proc'):
+                names = _proc_process_names()
+            else:
+                names = _psutil_process_names()
+            
+            for name in names:
+                if self._is_browser_name(name):
+                    # Browser is running, could have YouTube open
+                    self._browser_seen_until = now + self.browser_cache_seconds
+                    return True
         except Exception as e:
             print(f"Error in simple browser check: {e}")
         
         return False
     
+    def _check_videos_if_due(self, reason: str) -> bool:
+        """Check for new videos unless a check ran within min_check_interval."""
+        current_time = time.time()
+        if current_time - self._last_checked < self.min_check_interval:
+            return False
+        
+        print(f"\n[{time.strftime('%H:%M:%S')}] {reason} - Checking for new videos...")
+        # Pick up channels added with setup.py while the monitor is running
+        if self.notifier.reload_if_changed():
+            print("Configuration changed, reloaded channels.")
+        self.notifier.check_channels(background=True)
+        self._last_checked = current_time
+        return True
+    
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread_id, timestamp):
+        """WinEvent callback: note when a YouTube window is in the foreground."""
+        if event == EVENT_OBJECT_NAMECHANGE:
+            # Title changes (e.g. switching tabs) only matter for the foreground window
+            if id_object != OBJID_WINDOW or hwnd != _user32.GetForegroundWindow():
+                return
+        else:
+            self._watch_title_changes(hwnd)
+        try:
+            if 'youtube' in _window_title(hwnd).lower():
+                self._youtube_focused = True
+        except Exception as e:
+            print(f"Error reading window title: {e}")
+    
+    def _watch_title_changes(self, hwnd):
+        """
+        Hook title changes in the process that owns the foreground window.
+        
+        Name changes are frequent across the desktop, so only the foreground
+        process is hooked and the hook moves along with the focus.
+        """
+        process_id = wintypes.DWORD()
+        if hwnd:
+            _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(process_id))
+        if self._name_hook and process_id.value == self._name_hook_pid:
+            return
+        
+        if self._name_hook:
+            _user32.UnhookWinEvent(self._name_hook)
+            self._name_hook = None
+        self._name_hook_pid = process_id.value
+        if process_id.value:
+            # Without this hook only focus changes are seen, which still works
+            self._name_hook = _user32.SetWinEventHook(
+                EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE, None,
+                self._win_event_callback, process_id.value, 0, WINEVENT_OUTOFCONTEXT
+            )
+    
+    def _monitor_window_events(self) -> bool:
+        """
+        Wait for foreground window changes instead of polling (Windows).
+        
+        The process sleeps in MsgWaitForMultipleObjects until Windows delivers
+        a foreground or title change event. The wait times out once a second
+        only so that Ctrl+C can be handled.
+        
+        Returns:
+            False if the event hook could not be installed
+        """
+        # Kept on the instance so the callback isn't garbage collected
+        self._win_event_callback = WINEVENTPROC(self._on_win_event)
+        foreground_hook = _user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, None,
+            self._win_event_callback, 0, 0, WINEVENT_OUTOFCONTEXT
+        )
+        if not foreground_hook:
+            print(f"Could not watch window events ({ctypes.WinError(ctypes.get_last_error())})")
+            return False
+        
+        msg = wintypes.MSG()
+        try:
+            # The window that is already focused will not raise an event
+            self._on_win_event(None, EVENT_SYSTEM_FOREGROUND, _user32.GetForegroundWindow(), 0, 0, 0, 0)
+            
+            while True:
+                _user32.MsgWaitForMultipleObjects(0, None, False, 1000, QS_ALLINPUT)
+                while _user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                    _user32.TranslateMessage(ctypes.byref(msg))
+                    _user32.DispatchMessageW(ctypes.byref(msg))
+                
+                if self._youtube_focused and self._check_videos_if_due("YouTube detected"):
+                    self._youtube_focused = False
+        finally:
+            _user32.UnhookWinEvent(foreground_hook)
+            if self._name_hook:
+                _user32.UnhookWinEvent(self._name_hook)
+                self._name_hook = None
+    
+    def _monitor_polling(self, check_interval: int):
+        """Poll for running browsers every check_interval seconds."""
+        while True:
+            # Check if YouTube might be open (simplified check)
+            if self._check_browser_tabs_simple():
+                self._check_videos_if_due("Browser detected")
+            
+            time.sleep(check_interval)
+    
     def monitor(self, check_interval: int = 5):
         """
         Monitor for YouTube being opened and check for new videos.
         
+        On Windows this reacts to YouTube windows coming to the foreground;
+        elsewhere, or if the window events can't be watched, it polls for
+        running browser processes.
+        
         Args:
-            check_interval: Seconds between checks for YouTube being open
+            check_interval: Seconds between checks for YouTube being open (polling only)
         """
         print("Browser Monitor Started")
         print("Monitoring for YouTube to be opened...")
         print("Press Ctrl+C to stop\n")
         
-        last_checked = 0
-        min_check_interval = 60  # Minimum seconds between video checks
-        
         try:
-            while True:
-                # Check if YouTube might be open (simplified check)
-                browser_open = self._check_browser_tabs_simple()
-                
-                if browser_open:
-                    current_time = time.time()
-                    # Only check videos if enough time has passed
-                    if current_time - last_checked >= min_check_interval:
-                        print(f"\n[{time.strftime('%H:%M:%S')}] Browser detected - Checking for new videos...")
-                        self.notifier.check_channels()
-                        last_checked = current_time
-                
-                time.sleep(check_interval)
-                
+            if sys.platform != 'win32' or not self._monitor_window_events():
+                self._monitor_polling(check_interval)
         except KeyboardInterrupt:
             print("\n\nMonitor stopped by user.")
         except Exception as e:
@@ -108,11 +307,11 @@ class BrowserMonitor:
 
 def main():
     """Main function for browser monitoring."""
-    notifier = YouTubeNotifier()
-    monitor = BrowserMonitor(notifier)
-    
-    # Start monitoring
-    monitor.monitor(check_interval=5)
+    with YouTubeNotifier() as notifier:
+        monitor = BrowserMonitor(notifier)
+        
+        # Start monitoring
+        monitor.monitor(check_interval=5)
 
 
 if __name__ == "__main__":
@@ -26,21 +26,22 @@ def example_basic_usage():
 
 def example_programmatic_setup():
     """Example of setting up channels programmatically."""
-    notifier = YouTubeNotifier()
-    
-    # Add multiple channels
-    channels = [
-        "https://www.youtube.com/@mkbhd",
-        "https://www.youtube.com/@LinusTechTips",
-        # Add more channel URLs here
-    ]
-    
-    for channel_url in channels:
-        print(f"Adding channel: {channel_url}")
-        notifier.add_channel(channel_url)
-    
-    # Check for new videos
-    notifier.check_channels()
+    # The config file is written once when the block exits (or on flush()),
+    # not after every add_channel() call
+    with YouTubeNotifier() as notifier:
+        # Add multiple channels
+        channels = [
+            "https://www.youtube.com/@mkbhd",
+            "https://www.youtube.com/@LinusTechTips",
+            # Add more channel URLs here
+        ]
+        
+        for channel_url in channels:
+            print(f"Adding channel: {channel_url}")
+            notifier.add_channel(channel_url)
+        
+        # Check for new videos
+        notifier.check_channels()
 
 
 if __name__ == "__main__":
@@ -6,12 +6,8 @@ import sys
 from youtube_notifier import YouTubeNotifier
 
 
-def main():
-    """Interactive setup for adding channels."""
-    notifier = YouTubeNotifier()
-    
-    print("YouTube Notifier - Channel Setup")
-    print("=" * 40)
+def print_help():
+    """Print the available commands."""
     print("\nCommands:")
     print("  add <channel_url>  - Add a channel to monitor")
     print("  sync              - Sync channels from your YouTube account (requires API setup)")
@@ -19,6 +15,39 @@ def main():
     print("  remove <name>      - Remove a channel")
     print("  check              - Check for new videos now")
     print("  quit               - Exit setup\n")
+
+
+def main():
+    """Interactive setup for adding channels."""
+    notifier = YouTubeNotifier()
+    
+    def add(args):
+        notifier.add_channel(' '.join(args))
+        notifier.flush()
+    
+    def remove(args):
+        notifier.remove_channel(' '.join(args))
+        notifier.flush()
+    
+    def sync(args):
+        print("\nSyncing channels from your YouTube account...")
+        print("(This will open a browser for authentication)")
+        replace = input("Replace existing channels? (y/N): ").strip().lower() == 'y'
+        notifier.sync_from_youtube_account(replace_existing=replace)
+    
+    # Command name -> (handler, whether the command needs an argument)
+    handlers = {
+        'add': (add, True),
+        'remove': (remove, True),
+        'sync': (sync, False),
+        'list': (lambda args: notifier.list_channels(), False),
+        'check': (lambda args: notifier.check_channels(), False),
+        'help': (lambda args: print_help(), False),
+    }
+    
+    print("YouTube Notifier - Channel Setup")
+    print("=" * 40)
+    print_help()
     
     while True:
         try:
@@ -27,37 +56,18 @@ def main():
             if not command:
                 continue
             
-            cmd = command[0].lower()
+            cmd, args = command[0].lower(), command[1:]
             
             if cmd == 'quit' or cmd == 'exit':
                 print("Goodbye!")
                 break
-            elif cmd == 'add' and len(command) > 1:
-                channel_url = ' '.join(command[1:])
-                notifier.add_channel(channel_url)
-            elif cmd == 'sync':
-                print("\nSyncing channels from your YouTube account...")
-                print("(This will open a browser for authentication)")
-                replace = input("Replace existing channels? (y/N): ").strip().lower() == 'y'
-                notifier.sync_from_youtube_account(replace_existing=replace)
-            elif cmd == 'list':
-                notifier.list_channels()
-            elif cmd == 'remove' and len(command) > 1:
-                channel_name = ' '.join(command[1:])
-                notifier.remove_channel(channel_name)
-            elif cmd == 'check':
-                notifier.check_channels()
-            elif cmd == 'help':
-                print("\nCommands:")
-                print("  add <channel_url>  - Add a channel to monitor")
-                print("  sync              - Sync channels from your YouTube account (requires API setup)")
-                print("  list               - List all monitored channels")
-                print("  remove <name>      - Remove a channel")
-                print("  check              - Check for new videos now")
-                print("  quit               - Exit setup\n")
-            else:
+            
+            handler, needs_args = handlers.get(cmd, (None, False))
+            if handler is None or (needs_args and not args):
                 print("Unknown command. Type 'help' for available commands.")
-                
+                continue
+            handler(args)
+        
         except KeyboardInterrupt:
             print("\n\nGoodbye!")
             break
@@ -67,4 +77,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,122 @@
+"""
+Checks for the video history database and the channel check.
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+from youtube_notifier import YouTubeNotifier
+
+
+@unittest.skipUnless(hasattr(time, 'tzset'), "time.tzset() is not available")
+class TimestampMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self._old_tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'America/New_York'
+        time.tzset()
+        self.addCleanup(self._restore_tz)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_path = os.path.join(tmp.name, 'videos.db')
+        self.config_path = os.path.join(tmp.name, 'config.json')
+
+    def _restore_tz(self):
+        if self._old_tz is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = self._old_tz
+        time.tzset()
+
+    def test_text_schema_is_migrated_without_shifting_times(self):
+        # Rows as the old schema stored them: upload_date from yt-dlp and a
+        # naive local first_seen_at from datetime.now().isoformat()
+        first_seen = datetime(2024, 7, 1, 20, 30, 15, 123456)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE videos (
+                video_id TEXT PRIMARY KEY,
+                channel_id TEXT,
+                channel_name TEXT,
+                title TEXT,
+                url TEXT,
+                published_at TEXT,
+                first_seen_at TEXT
+            )
+        ''')
+        conn.executemany('INSERT INTO videos VALUES (?, ?, ?, ?, ?, ?, ?)', [
+            ('a', 'UC1', 'Channel', 'Title', 'url', '20240701', first_seen.isoformat()),
+            ('b', 'UC1', 'Channel', 'Title', 'url', '2024-07-01T12:00:00+00:00', 'not a date'),
+        ])
+        conn.commit()
+        conn.close()
+
+        notifier = YouTubeNotifier(self.config_path, self.db_path)
+        rows = {
+            row[0]: row[1:]
+            for row in notifier._conn.execute(
+                'SELECT video_id, published_at, first_seen_at FROM videos')
+        }
+        column_types = {
+            row[1]: row[2] for row in notifier._conn.execute('PRAGMA table_info(videos)')
+        }
+        notifier.close()
+
+        self.assertEqual(column_types['published_at'], 'INTEGER')
+        self.assertEqual(column_types['first_seen_at'], 'INTEGER')
+        # 2024-07-01 20:30:15 EDT is 2024-07-02 00:30:15 UTC
+        self.assertEqual(rows['a'], (1719792000, 1719880215))
+        self.assertEqual(rows['b'], (1719835200, None))
+
+
+class CheckChannelsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.notifier = YouTubeNotifier(
+            os.path.join(tmp.name, 'config.json'), os.path.join(tmp.name, 'videos.db'))
+        self.addCleanup(self.notifier.close)
+        self.notifier.config['channels'] = [
+            {'channel_id': 'UCa', 'channel_name': 'A'},
+            {'channel_id': 'UCb', 'channel_name': 'B'},
+        ]
+        self.notifier._get_latest_videos = lambda channel, max_results: [{
+            'video_id': channel['channel_name'] + 'v',
+            'channel_id': channel['channel_id'],
+            'channel_name': channel['channel_name'],
+            'title': 'Title',
+        }]
+        self.notified = []
+        self.notifier._send_notification = lambda video: self.notified.append(video['video_id'])
+
+    def test_failed_check_loses_no_videos(self):
+        filter_new_videos = self.notifier._filter_new_videos
+        failures = []
+
+        def flaky_filter(videos):
+            # Fail once for channel B, as a locked database would
+            if videos[0]['channel_id'] == 'UCb' and not failures:
+                failures.append(True)
+                raise sqlite3.OperationalError('database is locked')
+            return filter_new_videos(videos)
+
+        self.notifier._filter_new_videos = flaky_filter
+        with self.assertRaises(sqlite3.OperationalError):
+            self.notifier.check_channels()
+        self.assertEqual(self.notified, [])
+
+        self.notifier.check_channels()
+        self.assertEqual(sorted(self.notified), ['Av', 'Bv'])
+        stored = {row[0] for row in self.notifier._conn.execute('SELECT video_id FROM videos')}
+        self.assertEqual(stored, {'Av', 'Bv'})
+
+        self.notifier.check_channels()
+        self.assertEqual(len(self.notified), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
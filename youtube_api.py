@@ -6,17 +6,16 @@ Handles authentication and fetching subscribed channels from YouTube account.
 import os
 import json
 import pickle
+from importlib.util import find_spec
 from typing import List, Dict, Optional
 
-try:
-    from google.auth.transport.requests import Request
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
-    API_AVAILABLE = True
-except ImportError:
-    API_AVAILABLE = False
+# The Google client libraries are slow to import, so only check that they are
+# installed here and import them when authenticating
+API_AVAILABLE = all(
+    find_spec(module) is not None
+    for module in ('google_auth_oauthlib', 'googleapiclient')
+)
+if not API_AVAILABLE:
     print("Warning: Google API libraries not installed. Install with: pip install google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client")
 
 
@@ -51,6 +50,10 @@ class YouTubeAPI:
             print("YouTube Data API libraries not available.")
             return False
         
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from googleapiclient.discovery import build
+        
         creds = None
         
         # Load existing token if available
@@ -120,17 +123,23 @@ class YouTubeAPI:
             if not self.authenticate():
                 return []
         
+        from googleapiclient.errors import HttpError
+        
         try:
             channels = []
             next_page_token = None
             
+            # Page tokens only come back with the previous page, so pages have to
+            # be fetched in order. Keep each round trip small instead: request
+            # only the snippet part and trim the response to the fields used.
             while len(channels) < max_results:
                 # Get subscriptions
                 request = self.service.subscriptions().list(
-                    part='snippet,contentDetails',
+                    part='snippet',
                     mine=True,
                     maxResults=min(50, max_results - len(channels)),
-                    pageToken=next_page_token
+                    pageToken=next_page_token,
+                    fields='nextPageToken,items/snippet(title,publishedAt,resourceId/channelId)'
                 )
                 response = request.execute()
                 
@@ -179,7 +188,7 @@ class YouTubeAPI:
         
         try:
             request = self.service.channels().list(
-                part='snippet,contentDetails',
+                part='snippet,statistics',
                 id=channel_id
             )
             response = request.execute()
@@ -3,22 +3,93 @@ YouTube New Video Notifier
 Monitors subscribed channels and sends notifications when new videos are posted.
 """
 
-import json
+import atexit
+import queue
 import sqlite3
+import sys
+import threading
 import time
 import os
-from datetime import datetime
+import re
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Optional
-
-import yt_dlp
-from plyer import notification
+from typing import Iterator, List, Dict, Optional, Tuple
 
 try:
-    from youtube_api import YouTubeAPI
-    API_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    API_AVAILABLE = False
+    import json
+    ORJSON_AVAILABLE = False
+
+
+# Upper bound on concurrent channel fetches in check_channels; kept modest so
+# checking many channels doesn't get rate-limited by YouTube
+MAX_FETCH_WORKERS = 8
+
+# Number of recently seen video IDs kept in memory (raised when there are more
+# channels than fit their preloaded videos); older IDs are looked up in the
+# database when a feed lists them again. Memory depends on the channel count,
+# not on how much history the database holds.
+SEEN_CACHE_SIZE = 10000
+
+# Most recent videos per channel loaded into that cache at startup; a channel
+# feed never lists more than this many uploads
+SEEN_PRELOAD_PER_CHANNEL = 15
+
+# Per-channel uploads feed; far smaller than the channel page yt-dlp scrapes
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+FEED_NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'yt': 'http://www.youtube.com/xml/schemas/2015',
+}
+
+# Shared HTTP session so feed requests reuse kept-alive TLS connections to
+# youtube.com instead of resolving and handshaking for every channel. The pool
+# holds one connection per concurrent fetch. Created on the first feed fetch,
+# so commands that never fetch don't load requests.
+_SESSION: Optional["requests.Session"] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session() -> "requests.Session":
+    """Return the shared HTTP session, creating it on first use."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_maxsize=MAX_FETCH_WORKERS, max_retries=1))
+            _SESSION = session
+        return _SESSION
+
+
+def _to_timestamp(value) -> Optional[int]:
+    """
+    Convert a publish date to epoch seconds.
+    
+    Accepts epoch numbers, ISO 8601 strings and YYYYMMDD strings (yt-dlp's
+    upload_date, a UTC date). ISO strings without an offset are local time,
+    as written by datetime.now().isoformat(). Returns None if the value
+    can't be parsed.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        if len(value) == 8 and value.isdigit():
+            parsed = datetime.strptime(value, '%Y%m%d').replace(tzinfo=timezone.utc)
+        else:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return int(parsed.timestamp())
 
 
 class YouTubeNotifier:
@@ -27,24 +98,122 @@ class YouTubeNotifier:
         self.config_path = config_path
         self.db_path = db_path
         self.config = self._load_config()
+        self._config_mtime = self._get_config_mtime()
+        # Config changes are written by flush() rather than on every edit
+        self._dirty = False
+        # Recently seen video IDs in least- to most-recently-used order
+        self._seen_ids: "OrderedDict[str, None]" = OrderedDict()
+        # Feed validators per channel: channel_id -> (etag, last_modified)
+        self._feed_validators: Dict[str, Tuple[str, str]] = {}
+        # Validators received during the current check, saved once it completes
+        self._pending_validators: Dict[str, Tuple[str, str]] = {}
+        # Time until which each channel's last feed response is still fresh
+        # according to its Cache-Control max-age
+        self._feed_fresh_until: Dict[str, float] = {}
+        self._ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'extract_flat': True,
+        }
+        # Idle YoutubeDL instances, reused across calls. Once the notifier is
+        # closed, instances still in use are closed when they are returned.
+        self._ydl_pool: queue.SimpleQueue = queue.SimpleQueue()
+        self._ydl_lock = threading.Lock()
+        self._closed = False
         self._init_database()
         
+        # Notifications are shown by a background worker so a slow toast
+        # doesn't hold up the check that found the video
+        self._notify_queue: queue.Queue = queue.Queue()
+        threading.Thread(target=self._notify_worker, daemon=True).start()
+        # Set by stop() to end run_forever() without waiting out the interval
+        self._stop_event = threading.Event()
+        # Whether background checks have reported that notifications are off
+        self._reported_disabled = False
+        atexit.register(self.close)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
     def _load_config(self) -> dict:
         """Load configuration from JSON file."""
         if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            data = Path(self.config_path).read_bytes()
+            return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
         return {"channels": [], "check_interval_seconds": 60, "notification_enabled": True}
     
     def _save_config(self):
-        """Save configuration to JSON file."""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        """
+        Save configuration to JSON file.
+        
+        The file is written to a temporary path and then moved into place, so
+        a crash mid-write never leaves a truncated config behind.
+        """
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self.config, indent=2, ensure_ascii=False).encode('utf-8')
+        tmp_path = f"{self.config_path}.tmp"
+        Path(tmp_path).write_bytes(data)
+        os.replace(tmp_path, self.config_path)
+        self._config_mtime = self._get_config_mtime()
+    
+    def _get_config_mtime(self) -> Optional[float]:
+        """Return the config file's modification time, or None if it doesn't exist."""
+        try:
+            return os.stat(self.config_path).st_mtime
+        except FileNotFoundError:
+            return None
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the configuration if the file was modified by another process.
+        
+        Only the file's modification time is checked, so this is cheap to call
+        before every check. Unsaved in-memory changes are never overwritten.
+        If the file can't be parsed (e.g. it is being edited by hand), the
+        current configuration is kept and the next call tries again.
+        
+        Returns:
+            True if the configuration was reloaded, False otherwise
+        """
+        if self._dirty:
+            return False
+        
+        mtime = self._get_config_mtime()
+        if mtime == self._config_mtime:
+            return False
+        
+        try:
+            config = self._load_config()
+        except ValueError as e:
+            # orjson.JSONDecodeError and json.JSONDecodeError are ValueErrors
+            print(f"Warning: could not parse {self.config_path}, keeping current configuration: {e}")
+            return False
+        self.config = config
+        self._config_mtime = mtime
+        return True
+    
+    def flush(self):
+        """Write the configuration to disk if it has unsaved changes."""
+        if self._dirty:
+            self._save_config()
+            self._dirty = False
     
     def _init_database(self):
         """Initialize SQLite database for tracking videos."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One connection is kept open for the notifier's lifetime. It may be
+        # used from more than one thread, so all access goes through _db_lock.
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA cache_size=-20000')  # ~20 MB page cache
+        cursor = self._conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS videos (
                 video_id TEXT PRIMARY KEY,
@@ -52,12 +221,104 @@ class YouTubeNotifier:
                 channel_name TEXT,
                 title TEXT,
                 url TEXT,
-                published_at TEXT,
-                first_seen_at TEXT
+                published_at INTEGER,
+                first_seen_at INTEGER
+            )
+        ''')
+        self._migrate_timestamps(cursor)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_videos_channel
+            ON videos (channel_id, published_at DESC)
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS channel_cache (
+                channel_id TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS channel_info (
+                lookup_url TEXT PRIMARY KEY,
+                channel_id TEXT,
+                channel_name TEXT,
+                channel_url TEXT
             )
         ''')
-        conn.commit()
-        conn.close()
+        self._conn.commit()
+        
+        self._feed_validators = {
+            row[0]: (row[1], row[2])
+            for row in cursor.execute('SELECT channel_id, etag, last_modified FROM channel_cache')
+        }
+        
+        # Keep each monitored channel's latest video IDs in memory so freshness
+        # checks are usually a dict lookup. These are the only videos a feed
+        # can list; each lookup is a short range scan of idx_videos_channel.
+        self._seen_ids = OrderedDict()
+        for channel in self.config.get('channels', []):
+            channel_id = channel.get('channel_id')
+            if not channel_id:
+                continue
+            for row in cursor.execute(
+                'SELECT video_id FROM videos WHERE channel_id = ? ORDER BY published_at DESC LIMIT ?',
+                (channel_id, SEEN_PRELOAD_PER_CHANNEL)
+            ):
+                self._mark_seen(row[0])
+    
+    def _migrate_timestamps(self, cursor: sqlite3.Cursor):
+        """Convert a videos table with ISO date strings to epoch-second integers."""
+        columns = {row[1]: row[2] for row in cursor.execute('PRAGMA table_info(videos)')}
+        if columns.get('published_at') == 'INTEGER':
+            return
+        
+        print("Migrating video history to integer timestamps...")
+        rows = [
+            row[:5] + (_to_timestamp(row[5]), _to_timestamp(row[6]))
+            for row in cursor.execute('''
+                SELECT video_id, channel_id, channel_name, title, url, published_at, first_seen_at
+                FROM videos
+            ''')
+        ]
+        # SQLite can't change a column's type in place, so rebuild the table
+        # in a single transaction
+        with self._conn:
+            cursor.execute('BEGIN')
+            cursor.execute('DROP INDEX IF EXISTS idx_videos_channel')
+            cursor.execute('ALTER TABLE videos RENAME TO videos_old')
+            cursor.execute('''
+                CREATE TABLE videos (
+                    video_id TEXT PRIMARY KEY,
+                    channel_id TEXT,
+                    channel_name TEXT,
+                    title TEXT,
+                    url TEXT,
+                    published_at INTEGER,
+                    first_seen_at INTEGER
+                )
+            ''')
+            cursor.executemany('INSERT INTO videos VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            cursor.execute('DROP TABLE videos_old')
+    
+    def close(self):
+        """
+        Save pending config changes, wait for queued notifications and release
+        the database connection and pooled YoutubeDL instances.
+        """
+        self.flush()
+        self._notify_queue.join()
+        with self._ydl_lock:
+            self._closed = True
+            while True:
+                try:
+                    ydl = self._ydl_pool.get_nowait()
+                except queue.Empty:
+                    break
+                ydl.close()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
     def add_channel(self, channel_url: str) -> bool:
         """
@@ -88,23 +349,67 @@ class YouTubeNotifier:
                 'channel_url': channel_info.get('channel_url'),
                 'added_at': datetime.now().isoformat()
             })
-            self._save_config()
+            self._dirty = True
             print(f"Added channel: {channel_info.get('channel_name')}")
             return True
         except Exception as e:
             print(f"Error adding channel: {e}")
             return False
     
+    @contextmanager
+    def _youtube_dl(self) -> Iterator["yt_dlp.YoutubeDL"]:
+        """
+        Borrow a YoutubeDL instance from the pool.
+        
+        Building a YoutubeDL is expensive, so instances are kept and reused.
+        They are not thread-safe, so each concurrent fetch borrows its own.
+        """
+        try:
+            ydl = self._ydl_pool.get_nowait()
+        except queue.Empty:
+            # Imported on first use; yt-dlp loads hundreds of extractor modules
+            import yt_dlp
+            ydl = yt_dlp.YoutubeDL(self._ydl_opts)
+        try:
+            yield ydl
+        finally:
+            with self._ydl_lock:
+                if self._closed:
+                    ydl.close()
+                else:
+                    self._ydl_pool.put(ydl)
+    
     def _get_channel_info(self, channel_url: str) -> Optional[Dict]:
-        """Get channel information from URL."""
+        """
+        Get channel information from URL.
+        
+        Resolved channels are remembered in the database, so adding the same
+        URL again doesn't scrape the channel page a second time.
+        """
+        lookup_url = channel_url.strip()
+        with self._db_lock:
+            row = self._conn.execute(
+                'SELECT channel_id, channel_name, channel_url FROM channel_info WHERE lookup_url = ?',
+                (lookup_url,)
+            ).fetchone()
+        if row:
+            return {'channel_id': row[0], 'channel_name': row[1], 'channel_url': row[2]}
+        
+        channel_info = self._resolve_channel_info(lookup_url)
+        if channel_info and channel_info.get('channel_id'):
+            with self._db_lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO channel_info VALUES (?, ?, ?, ?)',
+                    (lookup_url, channel_info['channel_id'],
+                     channel_info['channel_name'], channel_info['channel_url'])
+                )
+                self._conn.commit()
+        return channel_info
+    
+    def _resolve_channel_info(self, channel_url: str) -> Optional[Dict]:
+        """Get channel information by scraping the channel page with yt-dlp."""
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self._youtube_dl() as ydl:
                 info = ydl.extract_info(channel_url, download=False)
                 if 'channel_id' in info:
                     return {
@@ -124,16 +429,99 @@ class YouTubeNotifier:
             print(f"Error getting channel info: {e}")
         return None
     
-    def _get_latest_videos(self, channel_url: str, max_results: int = 5) -> List[Dict]:
-        """Get latest videos from a channel."""
+    def _get_latest_videos(self, channel: Dict, max_results: int = 5) -> List[Dict]:
+        """
+        Get latest videos from a channel.
+        
+        Uses the channel's RSS feed when its ID is known, otherwise falls back
+        to scraping the channel page with yt-dlp.
+        """
+        channel_id = channel.get('channel_id')
+        if channel_id:
+            return self._get_feed_videos(channel_id, max_results)
+        return self._scrape_latest_videos(channel.get('channel_url', ''), max_results)
+    
+    def _get_feed_videos(self, channel_id: str, max_results: int = 5) -> List[Dict]:
+        """
+        Get latest videos from a channel's RSS feed.
+        
+        The request is conditional on the ETag/Last-Modified seen last time.
+        An unchanged feed (304) returns no videos, since everything in it was
+        already recorded when it was last downloaded. While the previous
+        response is still fresh (Cache-Control max-age) no request is made.
+        """
+        if time.time() < self._feed_fresh_until.get(channel_id, 0):
+            return []
+        
+        headers = {}
+        etag, last_modified = self._feed_validators.get(channel_id, (None, None))
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-            }
+            response = _session().get(
+                FEED_URL.format(channel_id=channel_id), headers=headers, timeout=10)
+            if response.status_code == 304:
+                self._update_feed_freshness(channel_id, response.headers)
+                return []
+            response.raise_for_status()
+            
+            root = ET.fromstring(response.content)
+            channel_name = root.findtext('atom:title', 'Unknown', FEED_NAMESPACES)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            videos = []
+            for entry in root.iterfind('atom:entry', FEED_NAMESPACES):
+                if len(videos) >= max_results:
+                    break
+                video_id = entry.findtext('yt:videoId', '', FEED_NAMESPACES)
+                if video_id:
+                    videos.append({
+                        'video_id': video_id,
+                        'channel_id': channel_id,
+                        'channel_name': channel_name,
+                        'title': entry.findtext('atom:title', 'Unknown Title', FEED_NAMESPACES),
+                        'url': f"https://www.youtube.com/watch?v={video_id}",
+                        'published_at': _to_timestamp(
+                            entry.findtext('atom:published', '', FEED_NAMESPACES)),
+                    })
+            
+            # Remember validators only for feeds that parsed successfully
+            validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            if any(validators):
+                self._pending_validators[channel_id] = validators
+            self._update_feed_freshness(channel_id, response.headers)
+            return videos
+        except Exception as e:
+            print(f"Error getting feed for channel {channel_id}: {e}")
+        return []
+    
+    def _update_feed_freshness(self, channel_id: str, headers):
+        """
+        Record how long a feed response may be reused, from its Cache-Control header.
+        
+        The response's Age (time it already spent in a cache) is subtracted
+        from max-age, so a feed is never treated as fresh beyond the point
+        the CDN itself would refetch it.
+        """
+        cache_control = headers.get('Cache-Control', '').lower()
+        match = re.search(r'max-age=(\d+)', cache_control)
+        if match and 'no-cache' not in cache_control and 'no-store' not in cache_control:
+            try:
+                age = int(headers.get('Age', 0))
+            except ValueError:
+                age = 0
+            lifetime = int(match.group(1)) - age
+            if lifetime > 0:
+                self._feed_fresh_until[channel_id] = time.time() + lifetime
+                return
+        self._feed_fresh_until.pop(channel_id, None)
+    
+    def _scrape_latest_videos(self, channel_url: str, max_results: int = 5) -> List[Dict]:
+        """Get latest videos by scraping the channel page with yt-dlp."""
+        try:
+            with self._youtube_dl() as ydl:
                 info = ydl.extract_info(channel_url, download=False)
                 
                 videos = []
@@ -149,7 +537,8 @@ class YouTubeNotifier:
                                 'channel_name': entry.get('channel', entry.get('uploader', 'Unknown')),
                                 'title': entry.get('title', 'Unknown Title'),
                                 'url': f"https://www.youtube.com/watch?v={video_id}",
-                                'published_at': entry.get('upload_date', ''),
+                                'published_at': _to_timestamp(
+                                    entry.get('timestamp') or entry.get('upload_date')),
                             })
                 return videos
         except Exception as e:
@@ -157,76 +546,200 @@ class YouTubeNotifier:
         return []
     
     def _is_video_new(self, video_id: str) -> bool:
-        """Check if a video is new (not in database)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT video_id FROM videos WHERE video_id = ?', (video_id,))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return not exists
+        """Check if a video is missing from the recently seen cache."""
+        if video_id in self._seen_ids:
+            self._seen_ids.move_to_end(video_id)
+            return False
+        return True
     
-    def _save_video(self, video: Dict):
-        """Save video to database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR IGNORE INTO videos 
-            (video_id, channel_id, channel_name, title, url, published_at, first_seen_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            video['video_id'],
-            video.get('channel_id', ''),
-            video.get('channel_name', ''),
-            video.get('title', ''),
-            video.get('url', ''),
-            video.get('published_at', ''),
-            datetime.now().isoformat()
-        ))
-        conn.commit()
-        conn.close()
+    def _mark_seen(self, video_id: str):
+        """Add a video ID to the recently seen cache, evicting the oldest if full."""
+        self._seen_ids[video_id] = None
+        self._seen_ids.move_to_end(video_id)
+        # Always leave room for every channel's preloaded videos, otherwise
+        # users with many channels would evict them and hit the database
+        capacity = max(
+            SEEN_CACHE_SIZE,
+            len(self.config.get('channels', [])) * SEEN_PRELOAD_PER_CHANNEL
+        )
+        if len(self._seen_ids) > capacity:
+            self._seen_ids.popitem(last=False)
+    
+    def _filter_new_videos(self, videos: List[Dict]) -> List[Dict]:
+        """
+        Return the videos that have not been seen before.
+        
+        The in-memory set answers most lookups. IDs missing from it are
+        confirmed with a single query, because another process (e.g. a
+        manual check while the browser monitor runs) may have stored them.
+        """
+        candidates = [video for video in videos if self._is_video_new(video['video_id'])]
+        if not candidates:
+            return []
+        
+        ids = [video['video_id'] for video in candidates]
+        placeholders = ','.join('?' * len(ids))
+        with self._db_lock:
+            stored = {row[0] for row in self._conn.execute(
+                f'SELECT video_id FROM videos WHERE video_id IN ({placeholders})', ids
+            )}
+        for video_id in stored:
+            self._mark_seen(video_id)
+        return [video for video in candidates if video['video_id'] not in stored]
     
     def _send_notification(self, video: Dict):
-        """Send Windows notification for new video."""
+        """Queue a Windows notification for new video."""
         if not self.config.get('notification_enabled', True):
             return
         
-        try:
-            notification.notify(
-                title=f"New Video: {video.get('channel_name', 'Unknown Channel')}",
-                message=video.get('title', 'New video posted!'),
-                app_name="YouTube Notifier",
-                timeout=10
-            )
-        except Exception as e:
-            print(f"Error sending notification: {e}")
+        self._notify_queue.put(video)
+    
+    def _notify_worker(self):
+        """Show queued notifications one at a time (runs on a background thread)."""
+        while True:
+            video = self._notify_queue.get()
+            try:
+                from plyer import notification
+                notification.notify(
+                    title=f"New Video: {video.get('channel_name', 'Unknown Channel')}",
+                    message=video.get('title', 'New video posted!'),
+                    app_name="YouTube Notifier",
+                    timeout=10
+                )
+            except Exception as e:
+                print(f"Error sending notification: {e}")
+            finally:
+                self._notify_queue.task_done()
     
-    def check_channels(self):
-        """Check all monitored channels for new videos."""
+    def check_channels(self, background: bool = False):
+        """
+        Check all monitored channels for new videos.
+        
+        Args:
+            background: True for unattended periodic checks. These are skipped
+                while notifications are disabled, since nobody would see the
+                results; manual checks still run and print new videos.
+        """
+        if background and not self.config.get('notification_enabled', True):
+            if not self._reported_disabled:
+                print("Notifications are disabled; skipping background checks.")
+                self._reported_disabled = True
+            return
+        self._reported_disabled = False
+        
         if not self.config.get('channels'):
             print("No channels configured. Add channels using add_channel() method.")
             return
         
-        print(f"Checking {len(self.config['channels'])} channels...")
-        new_videos_count = 0
+        channels = self.config['channels']
+        print(f"Checking {len(channels)} channels...")
         
-        for channel in self.config['channels']:
-            channel_url = channel.get('channel_url', '')
-            channel_name = channel.get('channel_name', 'Unknown')
-            
-            print(f"Checking {channel_name}...")
-            videos = self._get_latest_videos(channel_url, max_results=5)
+        # Fetch all channels concurrently; the work is network-bound, so the
+        # threads overlap their waits. Each channel is handled on this thread
+        # as soon as its fetch completes, so database access stays
+        # single-threaded.
+        new_videos = []
+        found_ids = set()
+        # Validators left over from a check that was interrupted (e.g. by
+        # Ctrl+C) cover videos that were never stored, so never save them
+        self._pending_validators.clear()
+        try:
+            workers = min(MAX_FETCH_WORKERS, len(channels))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._get_latest_videos, channel, 5): channel
+                    for channel in channels
+                }
+                for future in as_completed(futures):
+                    channel_name = futures[future].get('channel_name', 'Unknown')
+                    
+                    print(f"Checking {channel_name}...")
+                    for video in self._filter_new_videos(future.result()):
+                        # The same video can be listed twice within one check
+                        if video['video_id'] not in found_ids:
+                            print(f"  NEW: {video['title']}")
+                            found_ids.add(video['video_id'])
+                            new_videos.append(video)
             
-            for video in videos:
-                if self._is_video_new(video['video_id']):
-                    print(f"  NEW: {video['title']}")
-                    self._save_video(video)
-                    self._send_notification(video)
-                    new_videos_count += 1
+            # Save the new videos and the feed validators in one transaction, so
+            # validators are never stored without the videos they cover
+            first_seen_at = int(time.time())
+            rows = [(
+                video['video_id'],
+                video.get('channel_id', ''),
+                video.get('channel_name', ''),
+                video.get('title', ''),
+                video.get('url', ''),
+                video.get('published_at'),
+                first_seen_at
+            ) for video in new_videos]
+            validators = [
+                (channel_id, etag, last_modified)
+                for channel_id, (etag, last_modified) in self._pending_validators.items()
+            ]
+            if rows or validators:
+                with self._db_lock, self._conn:
+                    self._conn.executemany('''
+                        INSERT OR IGNORE INTO videos 
+                        (video_id, channel_id, channel_name, title, url, published_at, first_seen_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', rows)
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO channel_cache (channel_id, etag, last_modified) VALUES (?, ?, ?)',
+                        validators
+                    )
+        except Exception:
+            # Nothing from this check was stored, so make sure the next check
+            # downloads the feeds again and finds these videos
+            self._pending_validators.clear()
+            self._feed_fresh_until.clear()
+            raise
+        self._feed_validators.update(self._pending_validators)
+        self._pending_validators.clear()
+        # Only stored videos may be remembered as seen
+        for video in new_videos:
+            self._mark_seen(video['video_id'])
+        
+        # Notify only once the videos are stored, so a failed save or a crash
+        # mid-check can't lead to the same video being announced twice
+        for video in new_videos:
+            self._send_notification(video)
+        
+        new_videos_count = len(new_videos)
         
         if new_videos_count == 0:
             print("No new videos found.")
         else:
             print(f"Found {new_videos_count} new video(s)!")
+        
+        self.flush()
+    
+    def run_forever(self):
+        """
+        Check for new videos every check_interval_seconds until stop() is called.
+        
+        The wait between checks blocks on an event, so stop() ends the loop
+        immediately instead of after the current interval. A stop() made
+        before the loop starts is honored too. An error in one check is
+        reported and the next check runs as scheduled.
+        """
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    if self.reload_if_changed():
+                        print("Configuration changed, reloaded channels.")
+                    self.check_channels(background=True)
+                except Exception as e:
+                    # e.g. "database is locked" while setup.py writes the database
+                    print(f"Error checking channels: {e}")
+                self._stop_event.wait(self.config.get('check_interval_seconds', 60))
+        finally:
+            # Reset only once the loop has ended, so run_forever() can be reused
+            self._stop_event.clear()
+    
+    def stop(self):
+        """Stop a running run_forever() loop."""
+        self._stop_event.set()
     
     def list_channels(self):
         """List all monitored channels."""
@@ -247,7 +760,7 @@ class YouTubeNotifier:
         ]
         
         if len(self.config['channels']) < original_count:
-            self._save_config()
+            self._dirty = True
             print(f"Removed channel: {channel_name}")
             return True
         else:
@@ -264,6 +777,12 @@ class YouTubeNotifier:
         Returns:
             Number of channels added
         """
+        # Imported here so commands that never sync don't load the API module
+        try:
+            from youtube_api import YouTubeAPI, API_AVAILABLE
+        except ImportError:
+            API_AVAILABLE = False
+        
         if not API_AVAILABLE:
             print("YouTube Data API not available. Install required packages:")
             print("pip install google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client")
@@ -293,14 +812,16 @@ class YouTubeNotifier:
         
         added_count = 0
         skipped_count = 0
+        existing_ids = {ch.get('channel_id') for ch in self.config['channels']}
         
         for channel in subscribed_channels:
             channel_id = channel.get('channel_id')
             
             # Check if channel already exists
-            if any(ch.get('channel_id') == channel_id for ch in self.config['channels']):
+            if channel_id in existing_ids:
                 skipped_count += 1
                 continue
+            existing_ids.add(channel_id)
             
             self.config['channels'].append({
                 'channel_id': channel_id,
@@ -311,7 +832,8 @@ class YouTubeNotifier:
             })
             added_count += 1
         
-        self._save_config()
+        self._dirty = True
+        self.flush()
         
         print(f"\nSync complete!")
         print(f"  Added: {added_count} channels")
@@ -324,13 +846,19 @@ class YouTubeNotifier:
 
 def main():
     """Main function for command-line usage."""
-    notifier = YouTubeNotifier()
-    
-    print("YouTube New Video Notifier")
-    print("=" * 40)
-    
-    # Check channels
-    notifier.check_channels()
+    with YouTubeNotifier() as notifier:
+        print("YouTube New Video Notifier")
+        print("=" * 40)
+        
+        if '--watch' in sys.argv[1:]:
+            # Keep checking every check_interval_seconds
+            try:
+                notifier.run_forever()
+            except KeyboardInterrupt:
+                print("\nStopped.")
+        else:
+            # Check channels
+            notifier.check_channels()
 
 
 if __name__ == "__main__":